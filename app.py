@@ -9,10 +9,22 @@ Features:
 """
 
 import os
-from datetime import datetime, date
+import time
+from functools import lru_cache
+from itertools import count
+from datetime import date
+from urllib.parse import quote
+
+from flask import (
+    Flask, render_template, request, redirect, url_for, flash, abort, g
+)
+from sqlalchemy import URL, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload
 
-from flask import Flask, render_template, request, redirect, url_for, flash
-from data_models import db, Author, Book
+from data_models import (
+    db, Author, Book, create_missing_indexes, create_search_index
+)
 
 # =========================
 # App & Config
@@ -23,28 +35,269 @@ app.secret_key = "dev-secret-key"
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
-app.config["SQLALCHEMY_DATABASE_URI"] = (
-    "sqlite:///" + os.path.join(BASE_DIR, "data", "library.sqlite")
+DATABASE_PATH = os.path.join(BASE_DIR, "data", "library.sqlite")
+
+# The default engine is the only writer. SQLite serializes writes anyway,
+# so a single pooled connection avoids writers queueing on file locks.
+app.config["SQLALCHEMY_DATABASE_URI"] = URL.create(
+    "sqlite", database=DATABASE_PATH
 )
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"pool_size": 1, "max_overflow": 0}
+
+# Read-only connections for pages that only read. In WAL mode they
+# run next to the writer instead of waiting for it. The path is
+# percent-quoted because SQLite parses it as a file: URI, and the URL is
+# built with URL.create so SQLAlchemy passes that quoting through as is.
+app.config["SQLALCHEMY_BINDS"] = {
+    "reader": {
+        "url": URL.create(
+            "sqlite",
+            database="file:" + quote(DATABASE_PATH),
+            query={"mode": "ro", "uri": "true"},
+        ),
+        "pool_size": 8,
+        "max_overflow": 0,
+    },
+}
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 db.init_app(app)
 
+# PRAGMAs applied to every new SQLite connection.
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# PRAGMA optimize refreshes planner statistics; run it every N requests.
+OPTIMIZE_EVERY = 1000
+request_counter = count(1)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Applies the SQLite PRAGMAs to a freshly opened connection.
+
+    Args:
+        dbapi_connection: Raw sqlite3 connection.
+        connection_record: SQLAlchemy connection pool record (unused).
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def set_writer_pragmas(dbapi_connection, connection_record):
+    """
+    Prepares a new connection of the writer engine.
+
+    Sets the page size for new databases and switches the database to
+    WAL mode, so readers are not blocked by writes. Both are skipped for
+    in-memory databases, which do not support WAL. Transaction handling
+    of the sqlite3 driver is disabled so that begin_immediate() controls
+    how transactions start.
+
+    Args:
+        dbapi_connection: Raw sqlite3 connection.
+        connection_record: SQLAlchemy connection pool record (unused).
+    """
+    dbapi_connection.isolation_level = None
+
+    if not SQLITE_IN_MEMORY:
+        cursor = dbapi_connection.cursor()
+        # Only takes effect on a new database, and only before WAL mode.
+        cursor.execute("PRAGMA page_size=8192")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    set_sqlite_pragmas(dbapi_connection, connection_record)
+
+
+def begin_immediate(connection):
+    """
+    Starts writer transactions with BEGIN IMMEDIATE.
+
+    Taking the write lock up front makes a busy database wait for
+    busy_timeout instead of failing with SQLITE_BUSY when a read
+    transaction is upgraded to a write.
+
+    Args:
+        connection: SQLAlchemy connection starting a transaction.
+    """
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@app.teardown_appcontext
+def optimize_database(exception=None):
+    """
+    Runs PRAGMA optimize on the writer every OPTIMIZE_EVERY requests.
+
+    Args:
+        exception: Exception raised during the request, if any.
+    """
+    if next(request_counter) % OPTIMIZE_EVERY or exception is not None:
+        return
+
+    try:
+        db.session.execute(db.text("PRAGMA optimize"))
+        db.session.commit()
+    except Exception:
+        app.logger.exception("PRAGMA optimize failed")
+        db.session.rollback()
+
+
+with app.app_context():
+    SQLITE_IN_MEMORY = db.engine.url.database in (None, "", ":memory:")
+    event.listen(db.engine, "connect", set_writer_pragmas)
+    event.listen(db.engine, "begin", begin_immediate)
+    event.listen(db.engines["reader"], "connect", set_sqlite_pragmas)
+
 # =========================
 # Helper functions
 # =========================
 
+def form_value(key: str) -> str:
+    """
+    Returns a submitted form field without surrounding whitespace.
+
+    Args:
+        key (str): Name of the form field.
+
+    Returns:
+        str: Stripped value, empty if the field is missing.
+    """
+    return (request.form.get(key) or "").strip()
+
+
+def parse_date(value: str) -> date:
+    """
+    Parses a date in the YYYY-MM-DD format sent by date inputs.
+
+    date.fromisoformat() also accepts other ISO 8601 forms such as
+    19900402 or 1990-W14-1, which are rejected here.
+
+    Args:
+        value (str): Date string to parse.
+
+    Returns:
+        date: The parsed date.
+
+    Raises:
+        ValueError: If the value is not a valid YYYY-MM-DD date.
+    """
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+    return date.fromisoformat(value)
+
+
 def is_in_future(d: date) -> bool:
     """
     Checks whether a given date is in the future.
 
+    Today's date is looked up once per request, so all checks of a
+    request compare against the same day.
+
     Args:
         d (date): Date to check.
 
     Returns:
         bool: True if the date is after today, False otherwise.
     """
-    return d > date.today()
+    if "today" not in g:
+        g.today = date.today()
+    return d > g.today
+
+
+def to_match_expression(query: str) -> str:
+    """
+    Builds an FTS5 MATCH expression from a user search query.
+
+    Every word is quoted, so FTS5 operators in the input are matched
+    literally, and used as a prefix.
+
+    Args:
+        query (str): Search text entered by the user.
+
+    Returns:
+        str: MATCH expression, empty if the query contains no words.
+    """
+    terms = []
+    for word in query.split():
+        terms.append('"' + word.replace('"', '""') + '"*')
+    return " ".join(terms)
+
+
+# Bumped whenever an author is added, so the author choices reload.
+authors_version = 0
+
+# Authors added by other processes show up after at most this many seconds.
+AUTHORS_CACHE_TTL = 60
+
+
+@lru_cache(maxsize=1)
+def load_author_choices(version: int, period: int) -> list:
+    """
+    Loads the id and name of all authors for the book form.
+
+    The result is cached per version and period; a new value of either
+    reloads the list. Authors are read through the "reader" engine.
+
+    Args:
+        version (int): Current value of authors_version.
+        period (int): Number of the current AUTHORS_CACHE_TTL interval.
+
+    Returns:
+        list: Rows with ``id`` and ``name`` attributes.
+    """
+    return db.session.execute(
+        db.select(Author.id, Author.name),
+        bind_arguments={"bind": db.engines["reader"]}
+    ).all()
+
+
+def get_author_choices() -> list:
+    """
+    Returns the cached author choices for the book form.
+
+    Returns:
+        list: Rows with ``id`` and ``name`` attributes.
+    """
+    period = int(time.monotonic() // AUTHORS_CACHE_TTL)
+    return load_author_choices(authors_version, period)
+
+
+def render_author_form(status: int = 200):
+    """
+    Renders the add author form with the values submitted so far.
+
+    Args:
+        status (int): HTTP status code of the response.
+
+    Returns:
+        tuple: Rendered template and status code.
+    """
+    return render_template("add_author.html", form=request.form), status
+
+
+def render_book_form(status: int = 200):
+    """
+    Renders the add book form with the values submitted so far.
+
+    Args:
+        status (int): HTTP status code of the response.
+
+    Returns:
+        tuple: Rendered template and status code.
+    """
+    authors = get_author_choices()
+    return render_template(
+        "add_book.html", authors=authors, form=request.form
+    ), status
 
 
 # =========================
@@ -58,13 +311,24 @@ def home():
 
     Displays all books in the library.
     Supports optional search by book title.
+    Authors are loaded in the same query to avoid one SELECT per book.
+    Books are read through the read-only "reader" engine.
     """
     query = request.args.get("q")
+    books_query = db.select(Book).options(joinedload(Book.author))
+
+    match = to_match_expression(query) if query else ""
+
+    if match:
+        matching_ids = db.text(
+            "SELECT rowid FROM book_fts WHERE book_fts MATCH :q"
+        ).bindparams(q=match).columns(db.column("rowid"))
+        books_query = books_query.where(Book.id.in_(matching_ids))
 
-    if query:
-        books = Book.query.filter(Book.title.ilike(f"%{query}%")).all()
-    else:
-        books = Book.query.all()
+    books = db.session.scalars(
+        books_query,
+        bind_arguments={"bind": db.engines["reader"]}
+    ).unique().all()
 
     return render_template("home.html", books=books)
 
@@ -80,61 +344,67 @@ def add_author():
 
     POST:
         Creates a new author after validating input data.
+        Invalid input re-renders the form with the entered values
+        and status 400.
     """
+    global authors_version
+
     if request.method == "POST":
         try:
-            name = request.form["name"].strip()
-            birth_date = datetime.strptime(
-                request.form["birth_date"], "%Y-%m-%d"
-            ).date()
+            name = form_value("name")
+            birth_date = parse_date(form_value("birth_date"))
 
-            date_of_death_raw = request.form.get("date_of_death")
+            date_of_death_raw = form_value("date_of_death")
             date_of_death = None
 
             if date_of_death_raw:
-                date_of_death = datetime.strptime(
-                    date_of_death_raw, "%Y-%m-%d"
-                ).date()
+                date_of_death = parse_date(date_of_death_raw)
 
             # Validation
             if is_in_future(birth_date):
                 flash("Birth date cannot be in the future.")
-                return redirect(url_for("add_author"))
+                return render_author_form(400)
 
             if date_of_death:
                 if is_in_future(date_of_death):
                     flash("Death date cannot be in the future.")
-                    return redirect(url_for("add_author"))
+                    return render_author_form(400)
 
                 if date_of_death < birth_date:
                     flash("Death date cannot be before birth date.")
-                    return redirect(url_for("add_author"))
+                    return render_author_form(400)
+
+            # Insert unless an author with the same name and birth date
+            # exists; the unique index does the duplicate check.
+            stmt = (
+                sqlite_insert(Author)
+                .values(
+                    name=name,
+                    birth_date=birth_date,
+                    date_of_death=date_of_death
+                )
+                .on_conflict_do_nothing(
+                    index_elements=["name", "birth_date"]
+                )
+                .returning(Author.id)
+            )
+            row = db.session.execute(stmt).first()
+            db.session.commit()
 
-            # Duplicate check
-            existing_author = Author.query.filter_by(
-                name=name, birth_date=birth_date
-            ).first()
-            if existing_author:
+            if row is None:
                 flash("Author already exists.")
-                return redirect(url_for("add_author"))
+                return render_author_form(400)
 
-            author = Author(
-                name=name,
-                birth_date=birth_date,
-                date_of_death=date_of_death
-            )
-
-            db.session.add(author)
-            db.session.commit()
+            authors_version += 1
 
             return redirect(url_for("home"))
 
         except Exception as e:
             db.session.rollback()
             flash(f"Error adding author: {e}")
-            return redirect(url_for("add_author"))
+            return render_author_form(400)
 
-    return render_template("add_author.html")
+    return render_author_form()
 
 
 # ---------- ADD BOOK ----------
@@ -148,38 +418,38 @@ def add_book():
 
     POST:
         Creates a new book linked to an author.
+        Invalid input re-renders the form with the entered values
+        and status 400.
     """
-    authors = Author.query.all()
-
     if request.method == "POST":
         try:
-            title = request.form["title"].strip()
-            isbn = request.form["isbn"].strip()
+            title = form_value("title")
+            isbn = form_value("isbn")
             author_id = int(request.form["author_id"])
 
-            # Duplicate check
-            existing_book = Book.query.filter_by(isbn=isbn).first()
-            if existing_book:
-                flash("Book with this ISBN already exists.")
-                return redirect(url_for("add_book"))
-
-            book = Book(
-                title=title,
-                isbn=isbn,
-                author_id=author_id
+            # Insert unless the ISBN exists; the unique index does
+            # the duplicate check.
+            stmt = (
+                sqlite_insert(Book)
+                .values(title=title, isbn=isbn, author_id=author_id)
+                .on_conflict_do_nothing(index_elements=["isbn"])
+                .returning(Book.id)
             )
-
-            db.session.add(book)
+            row = db.session.execute(stmt).first()
             db.session.commit()
 
+            if row is None:
+                flash("Book with this ISBN already exists.")
+                return render_book_form(400)
+
             return redirect(url_for("home"))
 
         except Exception as e:
             db.session.rollback()
             flash(f"Error adding book: {e}")
-            return redirect(url_for("add_book"))
+            return render_book_form(400)
 
-    return render_template("add_book.html", authors=authors)
+    return render_book_form()
 
 
 # ---------- DELETE BOOK ----------
@@ -188,32 +458,78 @@ def delete_book(book_id):
     """
     Delete book route.
 
-    Deletes a book by its ID.
+    Deletes a book by its ID with a single DELETE statement.
+    Responds with 404 if no book has that ID.
     """
     try:
-        book = Book.query.get_or_404(book_id)
-        db.session.delete(book)
+        result = db.session.execute(db.delete(Book).where(Book.id == book_id))
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         flash(f"Error deleting book: {e}")
+        return redirect(url_for("home"))
+
+    if result.rowcount == 0:
+        abort(404)
 
     return redirect(url_for("home"))
 
 
 # =========================
-# App start
+# Database setup
 # =========================
 
-if __name__ == "__main__":
+def init_db():
     """
-    Application entry point.
+    Creates database tables, indexes and the search index.
 
-    Creates database tables and starts the Flask server.
+    Must be called inside an application context.
     """
     os.makedirs(os.path.join(BASE_DIR, "data"), exist_ok=True)
 
-    with app.app_context():
-        db.create_all()
+    db.create_all()
+    create_missing_indexes()
+    create_search_index()
 
+
+@app.cli.command("init-db")
+def init_db_command():
+    """
+    Creates the database schema: ``flask --app app init-db``.
+    """
+    init_db()
+
+
+def database_is_initialized() -> bool:
+    """
+    Checks whether the schema exists by probing for the search table,
+    which is created last by init_db().
+
+    Returns:
+        bool: True if the book_fts table exists, False otherwise.
+    """
+    return db.inspect(db.engine).has_table("book_fts")
+
+
+# Every process (python app.py, flask run, each gunicorn worker) sets up
+# the schema once at import if it is missing; the routes depend on the
+# search table and the unique indexes. Otherwise only a has_table probe
+# runs. Set INIT_DB to rerun the setup on an initialized database.
+os.makedirs(os.path.join(BASE_DIR, "data"), exist_ok=True)
+
+with app.app_context():
+    if os.getenv("INIT_DB") or not database_is_initialized():
+        init_db()
+
+
+# =========================
+# App start
+# =========================
+
+if __name__ == "__main__":
+    """
+    Application entry point.
+
+    Starts the Flask server.
+    """
     app.run(debug=True)
@@ -6,6 +6,7 @@ and their relationships.
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 
 db = SQLAlchemy()
 
@@ -22,12 +23,23 @@ class Author(db.Model):
         books (list[Book]): List of books written by the author.
     """
 
+    __table_args__ = (
+        db.Index("uq_author_name_birth", "name", "birth_date", unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
     birth_date = db.Column(db.Date, nullable=False)
     date_of_death = db.Column(db.Date, nullable=True)
 
-    books = db.relationship("Book", backref="author", lazy=True)
+    books = db.relationship("Book", back_populates="author", lazy=True)
+
+    @validates("name")
+    def strip_name(self, key, value):
+        """
+        Removes surrounding whitespace from the name before it is stored.
+        """
+        return value.strip() if value is not None else value
 
     def __repr__(self):
         """
@@ -49,17 +61,87 @@ class Book(db.Model):
     """
 
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(150), nullable=False)
-    isbn = db.Column(db.String(150), nullable=False)
+    title = db.Column(db.String(150), nullable=False, index=True)
+    isbn = db.Column(db.String(150), nullable=False, unique=True, index=True)
 
     author_id = db.Column(
         db.Integer,
         db.ForeignKey("author.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
+    author = db.relationship("Author", back_populates="books")
+
+    @validates("title", "isbn")
+    def strip_text(self, key, value):
+        """
+        Removes surrounding whitespace from title and ISBN before they
+        are stored.
+        """
+        return value.strip() if value is not None else value
+
     def __repr__(self):
         """
         Returns a string representation of the Book instance.
         """
         return f"<Book {self.title}>"
+
+
+# Indexes added after the first release. db.create_all() does not alter
+# existing tables, so older databases get them through this migration.
+INDEX_MIGRATIONS = (
+    "DROP INDEX IF EXISTS ix_author_name_birth",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_author_name_birth "
+    "ON author (name, birth_date)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_book_isbn ON book (isbn)",
+    "CREATE INDEX IF NOT EXISTS ix_book_title ON book (title)",
+    "CREATE INDEX IF NOT EXISTS ix_book_author_id ON book (author_id)",
+)
+
+
+def create_missing_indexes():
+    """
+    Creates the indexes on databases created before they were defined.
+
+    Must be called inside an application context.
+    """
+    for statement in INDEX_MIGRATIONS:
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+
+# Full-text index over book titles. It is an external-content FTS5 table
+# that the triggers keep in sync with the book table.
+SEARCH_INDEX_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS book_fts "
+    "USING fts5(title, content='book', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS book_fts_after_insert "
+    "AFTER INSERT ON book BEGIN "
+    "INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS book_fts_after_delete "
+    "AFTER DELETE ON book BEGIN "
+    "INSERT INTO book_fts(book_fts, rowid, title) "
+    "VALUES ('delete', old.id, old.title); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS book_fts_after_update "
+    "AFTER UPDATE ON book BEGIN "
+    "INSERT INTO book_fts(book_fts, rowid, title) "
+    "VALUES ('delete', old.id, old.title); "
+    "INSERT INTO book_fts(rowid, title) VALUES (new.id, new.title); "
+    "END",
+    "INSERT INTO book_fts(book_fts) VALUES ('rebuild')",
+)
+
+
+def create_search_index():
+    """
+    Creates the full-text search table for book titles and rebuilds it
+    from the current book rows.
+
+    Must be called inside an application context.
+    """
+    for statement in SEARCH_INDEX_STATEMENTS:
+        db.session.execute(db.text(statement))
+    db.session.commit()